@@ -4,40 +4,56 @@ Wrapper script to run the MCP server with FreeCAD's Python environment.
 This resolves Python version compatibility issues between FreeCAD and the current Python.
 """
 
+import hashlib
 import os
 import sys
 import subprocess
-import tempfile
+from pathlib import Path
 
 def create_freecad_runner():
-    """Create a temporary Python script that runs within FreeCAD's environment"""
+    """Write the runner script to a stable cache path and return it"""
 
     # Get the absolute path to our server code
     server_path = os.path.dirname(os.path.abspath(__file__))
     src_path = os.path.join(server_path, "src")
 
     runner_code = f'''
+import importlib.util
 import sys
-sys.path.insert(0, "{src_path}")
-
-# Install required dependencies in FreeCAD's environment
-try:
-    import pip
-    pip.main(['install', '--quiet', 'fastmcp>=2.11.3', 'loguru>=0.7.3'])
-except:
-    # Try subprocess if pip.main doesn't work
+
+src_path = "{src_path}"
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+# Install dependencies into FreeCAD's environment only if they are missing;
+# an unconditional pip install re-runs the resolver on every launch.
+missing = [
+    requirement
+    for module, requirement in (("fastmcp", "fastmcp>=2.11.3"), ("loguru", "loguru>=0.7.3"))
+    if importlib.util.find_spec(module) is None
+]
+if missing:
     import subprocess
-    subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--quiet', 'fastmcp>=2.11.3', 'loguru>=0.7.3'])
+    subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--quiet', *missing])
 
 # Now run our server
 from mcp_server_freecad.main import main
 main()
 '''
 
-    # Write to temporary file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-        f.write(runner_code)
-        return f.name
+    # Cache the runner under a content-hashed name so repeated launches reuse
+    # the same file; regenerate only when the generated code changes.
+    digest = hashlib.blake2b(runner_code.encode()).hexdigest()[:16]
+    cache_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "mcp-server-freecad"
+    runner_path = cache_dir / f"runner-{digest}.py"
+
+    if not runner_path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = runner_path.with_suffix('.py.tmp')
+        tmp_path.write_text(runner_code)
+        os.replace(tmp_path, runner_path)
+
+    return str(runner_path)
 
 def main():
     """Run the MCP server using FreeCAD's Python"""
@@ -64,24 +80,20 @@ def main():
 
     print(f"🚀 Using FreeCAD Python: {freecad_python}")
 
-    # Create temporary runner script
+    # Create (or reuse) the cached runner script
     runner_script = create_freecad_runner()
 
-    try:
-        # Set environment variables for FreeCAD
-        env = os.environ.copy()
-        env['PYTHONPATH'] = '/Applications/FreeCAD.app/Contents/Resources'
-        env['LD_LIBRARY_PATH'] = '/Applications/FreeCAD.app/Contents/Resources/lib'
-
-        # Run the server with FreeCAD's Python
-        subprocess.run([freecad_python, runner_script], env=env)
-
-    finally:
-        # Clean up temporary file
-        try:
-            os.unlink(runner_script)
-        except:
-            pass
+    # Set environment variables for FreeCAD (prepend only if not already present)
+    env = os.environ.copy()
+    freecad_resources = '/Applications/FreeCAD.app/Contents/Resources'
+    if freecad_resources not in env.get('PYTHONPATH', '').split(os.pathsep):
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [freecad_resources, env.get('PYTHONPATH')]))
+    freecad_lib = freecad_resources + '/lib'
+    if freecad_lib not in env.get('LD_LIBRARY_PATH', '').split(os.pathsep):
+        env['LD_LIBRARY_PATH'] = os.pathsep.join(filter(None, [freecad_lib, env.get('LD_LIBRARY_PATH')]))
+
+    # Run the server with FreeCAD's Python
+    subprocess.run([freecad_python, runner_script], env=env)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,85 @@
+"""Optional compiled helpers for the STL export path.
+
+numpy and numba are accelerators, not hard dependencies: when either is
+missing, NUMBA_AVAILABLE is False and _export_stl falls back to its
+pure-Python facet packing loop.
+"""
+
+try:
+   import numpy as np
+except ImportError:
+   np = None
+
+try:
+   import numba
+except ImportError:
+   numba = None
+
+NUMBA_AVAILABLE = np is not None and numba is not None
+
+if NUMBA_AVAILABLE:
+   # Binary STL facet record: normal + three vertices as little-endian
+   # float32, followed by a 16-bit attribute count (always zero).
+   STL_FACET_DTYPE = np.dtype([("data", "<f4", 12), ("attr", "<u2")])
+
+   # Explicit signature so the kernel compiles once (cached on disk via
+   # cache=True) instead of re-dispatching on argument types per call.
+   @numba.njit("float32[:, ::1](float64[:, ::1], int64[:, ::1])", cache=True, parallel=True)
+   def _facet_data(points, faces):
+      out = np.empty((faces.shape[0], 12), dtype=np.float32)
+
+      for i in numba.prange(faces.shape[0]):
+         a = points[faces[i, 0]]
+         b = points[faces[i, 1]]
+         c = points[faces[i, 2]]
+
+         ux, uy, uz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+         vx, vy, vz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+         nx = uy * vz - uz * vy
+         ny = uz * vx - ux * vz
+         nz = ux * vy - uy * vx
+         norm = (nx * nx + ny * ny + nz * nz) ** 0.5
+
+         if norm > 0.0:
+            nx, ny, nz = nx / norm, ny / norm, nz / norm
+
+         out[i, 0] = nx
+         out[i, 1] = ny
+         out[i, 2] = nz
+
+         for j in range(3):
+            out[i, 3 + j] = a[j]
+            out[i, 6 + j] = b[j]
+            out[i, 9 + j] = c[j]
+
+      return out
+
+
+def facet_records(points, facets):
+   """Pack one shape's (points, facets) tessellation into binary STL records.
+
+   Normals are computed per triangle in the compiled kernel; the returned
+   bytes are ready to append to an open binary STL file.
+   """
+   if not facets:
+      return b""
+
+   pts = np.array([(p[0], p[1], p[2]) for p in points], dtype=np.float64)
+   faces = np.asarray(facets, dtype=np.int64).reshape(-1, 3)
+
+   records = np.zeros(faces.shape[0], dtype=STL_FACET_DTYPE)
+   records["data"] = _facet_data(pts, faces)
+   return records.tobytes()
+
+
+def warm():
+   """Trigger JIT compilation of the kernels with a one-triangle dummy input.
+
+   Meant to run on a background thread at server startup so the first real
+   export doesn't pay the compile cost (cache=True makes later launches skip
+   it entirely). A no-op when numba/numpy are unavailable.
+   """
+   if not NUMBA_AVAILABLE:
+      return
+
+   facet_records([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)], [(0, 1, 2)])
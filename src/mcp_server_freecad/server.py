@@ -1,9 +1,16 @@
+import asyncio
+import struct
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Literal, NamedTuple
 
 from fastmcp import FastMCP
 from loguru import logger
 
+from . import _mesh_numba
+
 try:
    # Try adding FreeCAD.app path for macOS installations
    import sys
@@ -58,6 +65,53 @@ except Exception as e:
    Draft = Part = PartDesign = Sketcher = FreeCADGui = None
 
 
+class Vec3(NamedTuple):
+   """Coordinate triple passed between tool wrappers and private methods.
+
+   Flat attribute access replaces the {"x": .., "y": .., "z": ..} dicts that
+   used to be packed and unpacked on every call.
+   """
+   x: float
+   y: float
+   z: float
+
+
+ORIGIN = Vec3(0.0, 0.0, 0.0)
+Z_AXIS = Vec3(0.0, 0.0, 1.0)
+
+# Reusable FreeCAD.Vector instances for the unit axes, filled lazily on first
+# use because FreeCAD may not be importable at module load.
+_AXIS_VECTORS: Dict[Vec3, Any] = {}
+_UNIT_AXES = (Vec3(1.0, 0.0, 0.0), Vec3(0.0, 1.0, 0.0), Vec3(0.0, 0.0, 1.0))
+
+
+def _axis_vector(axis: Vec3):
+   vector = _AXIS_VECTORS.get(axis)
+
+   if vector is None:
+      vector = FreeCAD.Vector(*axis)
+
+      if axis in _UNIT_AXES:
+         _AXIS_VECTORS[axis] = vector
+
+   return vector
+
+
+def _pack_facet(a, b, c) -> bytes:
+   """Pack one triangle as a 50-byte binary STL record (pure-Python fallback)."""
+   ux, uy, uz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+   vx, vy, vz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+   nx = uy * vz - uz * vy
+   ny = uz * vx - ux * vz
+   nz = ux * vy - uy * vx
+   norm = (nx * nx + ny * ny + nz * nz) ** 0.5
+
+   if norm > 0.0:
+      nx, ny, nz = nx / norm, ny / norm, nz / norm
+
+   return struct.pack("<12fH", nx, ny, nz, a[0], a[1], a[2], b[0], b[1], b[2], c[0], c[1], c[2], 0)
+
+
 @dataclass
 class FreeCADOperation:
    description: str
@@ -70,11 +124,40 @@ class MCPServerFreeCAD:
       self.active_body = None
       self.doc = None
       self.server = FastMCP("freecad-mcp")
+      # O(1) default-name generation instead of len(self.doc.Objects) per create.
+      self._name_seq: Dict[str, int] = defaultdict(int)
+      # name -> document object, avoiding a linear doc.getObject scan per lookup.
+      self._obj_cache: Dict[str, Any] = {}
+      # Serializes document access between the event loop and the export
+      # worker thread; FreeCAD documents are not thread-safe.
+      self._doc_lock = threading.Lock()
+
+      # Compile the mesh kernels while the server is still starting up so the
+      # first export doesn't stall on numba's JIT.
+      threading.Thread(target=_mesh_numba.warm, daemon=True).start()
 
       if not freecad_available:
          logger.error("FreeCAD is not available. Server will start but operations will fail.")
          logger.error("Please install FreeCAD and ensure it's in your Python path.")
 
+      # Single dict lookup per call instead of an if/elif chain over every tool name.
+      self._dispatch: Dict[str, Any] = {
+         "boolean_operation": self._boolean_operation,
+         "create_box": self._create_box,
+         "create_cylinder": self._create_cylinder,
+         "create_document": self._create_document,
+         "create_pad": self._create_pad,
+         "create_pocket": self._create_pocket,
+         "create_sketch": self._create_sketch,
+         "create_sphere": self._create_sphere,
+         "export_stl": self._export_stl,
+         "flush": self._flush,
+         "list_objects": self._list_objects,
+         "move_object": self._move_object,
+         "rotate_object": self._rotate_object,
+         "save_document": self._save_document,
+      }
+
       self.setup_tools()
 
    ## ==========================================================================
@@ -82,121 +165,79 @@ class MCPServerFreeCAD:
    ## ==========================================================================
    def setup_tools(self):
       @self.server.tool(name="boolean_operation", description="Perform boolean operations (cut, intersection, union)")
-      async def boolean_operation(operation: Literal["cut", "intersection", "union"], base_object: str, tool_object: str, result_name: str | None = None) -> str:
-         args: Dict[str, Any] = {
-            "operation": operation,
-            "base_object": base_object,
-            "tool_object": tool_object,
-         }
-
-         if result_name is not None:
-            args["result_name"] = result_name
-
-         return await self._boolean_operation(args)
+      async def boolean_operation(operation: Literal["cut", "intersection", "union"], base_object: str, tool_object: str, result_name: str | None = None, defer_recompute: bool = False) -> str:
+         return await self._boolean_operation(
+            operation=operation,
+            base_object=base_object,
+            tool_object=tool_object,
+            result_name=result_name,
+            defer_recompute=defer_recompute,
+         )
 
       @self.server.tool(name="create_box", description="Create a rectangular box/cube")
-      async def create_box(length: float, width: float, height: float, x: float = 0, y: float = 0, z: float = 0, name: str | None = None) -> str:
-         args: Dict[str, Any] = {
-            "length": length,
-            "width": width,
-            "height": height,
-            "position": {"x": x, "y": y, "z": z},
-         }
-
-         if name is not None:
-            args["name"] = name
-
-         return await self._create_box(args)
+      async def create_box(length: float, width: float, height: float, x: float = 0, y: float = 0, z: float = 0, name: str | None = None, defer_recompute: bool = False) -> str:
+         return await self._create_box(
+            length=length,
+            width=width,
+            height=height,
+            position=Vec3(x, y, z),
+            name=name,
+            defer_recompute=defer_recompute,
+         )
 
       @self.server.tool(name="create_cylinder", description="Create a cylinder")
-      async def create_cylinder(radius: float, height: float, x: float = 0, y: float = 0, z: float = 0, name: str | None = None) -> str:
-         args: Dict[str, Any] = {
-            "radius": radius,
-            "height": height,
-            "position": {"x": x, "y": y, "z": z},
-         }
-
-         if name is not None:
-            args["name"] = name
-
-         return await self._create_cylinder(args)
+      async def create_cylinder(radius: float, height: float, x: float = 0, y: float = 0, z: float = 0, name: str | None = None, defer_recompute: bool = False) -> str:
+         return await self._create_cylinder(
+            radius=radius,
+            height=height,
+            position=Vec3(x, y, z),
+            name=name,
+            defer_recompute=defer_recompute,
+         )
 
       @self.server.tool(name="create_document", description="Create a new FreeCAD document")
       async def create_document(name: str) -> str:
-         return await self._create_document({"name": name})
+         return await self._create_document(name=name)
 
       @self.server.tool(name="create_pad", description="Create a pad (extrusion) from a sketch")
       async def create_pad(sketch_name: str, length: float, reversed: bool = False, name: str | None = None) -> str:
-         args: Dict[str, Any] = {
-            "sketch_name": sketch_name,
-            "length": length,
-            "reversed": reversed,
-         }
-
-         if name is not None:
-            args["name"] = name
-
-         return await self._create_pad(args)
+         return await self._create_pad(sketch_name=sketch_name, length=length, reversed=reversed, name=name)
 
       @self.server.tool(name="create_pocket", description="Create a pocket (cut) from a sketch")
       async def create_pocket(sketch_name: str, length: float, name: str | None = None) -> str:
-         args: Dict[str, Any] = {
-            "sketch_name": sketch_name,
-            "length": length,
-         }
-
-         if name is not None:
-            args["name"] = name
-
-         return await self._create_pocket(args)
+         return await self._create_pocket(sketch_name=sketch_name, length=length, name=name)
 
       @self.server.tool(name="create_sketch", description="Create a new sketch on a plane")
       async def create_sketch(plane: Literal["XY", "XZ", "YZ", "custom"], name: str | None = None) -> str:
-         args: Dict[str, Any] = {"plane": plane}
-
-         if name is not None:
-            args["name"] = name
-
-         return await self._create_sketch(args)
+         return await self._create_sketch(plane=plane, name=name)
 
       @self.server.tool(name="create_sphere", description="Create a sphere")
-      async def create_sphere(radius: float, x: float = 0, y: float = 0, z: float = 0, name: str | None = None) -> str:
-         args: Dict[str, Any] = {
-            "radius": radius,
-            "position": {"x": x, "y": y, "z": z},
-         }
+      async def create_sphere(radius: float, x: float = 0, y: float = 0, z: float = 0, name: str | None = None, defer_recompute: bool = False) -> str:
+         return await self._create_sphere(radius=radius, position=Vec3(x, y, z), name=name, defer_recompute=defer_recompute)
 
-         if name is not None:
-            args["name"] = name
-
-         return await self._create_sphere(args)
+      @self.server.tool(name="flush", description="Recompute the document once after deferred operations")
+      async def flush() -> str:
+         return await self._flush()
 
       @self.server.tool(name="export_stl", description="Export objects to STL file")
       async def export_stl(objects: list[str], filepath: str) -> str:
-         return await self._export_stl({"objects": objects, "filepath": filepath})
+         return await self._export_stl(objects=objects, filepath=filepath)
 
       @self.server.tool(name="list_objects", description="List all objects in the current document")
       async def list_objects() -> str:
          return await self._list_objects()
 
       @self.server.tool(name="move_object", description="Move an object to a new position")
-      async def move_object(object_name: str, x: float, y: float, z: float) -> str:
-         return await self._move_object({
-            "object_name": object_name,
-            "vector": {"x": x, "y": y, "z": z},
-         })
+      async def move_object(object_name: str, x: float, y: float, z: float, defer_recompute: bool = False) -> str:
+         return await self._move_object(object_name=object_name, vector=Vec3(x, y, z), defer_recompute=defer_recompute)
 
       @self.server.tool(name="rotate_object", description="Rotate an object around an axis")
-      async def rotate_object(object_name: str, ax: float, ay: float, az: float, angle: float) -> str:
-         return await self._rotate_object({
-            "object_name": object_name,
-            "axis": {"x": ax, "y": ay, "z": az},
-            "angle": angle,
-         })
+      async def rotate_object(object_name: str, ax: float, ay: float, az: float, angle: float, defer_recompute: bool = False) -> str:
+         return await self._rotate_object(object_name=object_name, axis=Vec3(ax, ay, az), angle=angle, defer_recompute=defer_recompute)
 
       @self.server.tool(name="save_document", description="Save the current document")
       async def save_document(filepath: str) -> str:
-         return await self._save_document({"filepath": filepath})
+         return await self._save_document(filepath=filepath)
 
       # Keep references so static analyzers (e.g., Pylance/PyCharm) treat these as accessed
       # even though the decorator registers them for runtime use.
@@ -210,6 +251,7 @@ class MCPServerFreeCAD:
          create_sketch,
          create_sphere,
          export_stl,
+         flush,
          list_objects,
          move_object,
          rotate_object,
@@ -217,177 +259,184 @@ class MCPServerFreeCAD:
       ]
 
    async def handle_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> str:
+      fn = self._dispatch.get(tool_name)
+
+      if fn is None:
+         return f"Unknown tool: {tool_name}"
+
+      # External callers may still send {"x": .., "y": .., "z": ..} dicts;
+      # flatten them once here so the private methods only see Vec3.
+      # Missing components fall back per key — a partial axis defaults to
+      # the Z axis as before, positions and move vectors to the origin —
+      # and the caller's dict is copied rather than rewritten in place.
+      flattened = None
+      for key, default in (("position", ORIGIN), ("vector", ORIGIN), ("axis", Z_AXIS)):
+         value = arguments.get(key)
+
+         if isinstance(value, dict):
+            if flattened is None:
+               flattened = dict(arguments)
+            flattened[key] = Vec3(float(value.get("x", default.x)), float(value.get("y", default.y)), float(value.get("z", default.z)))
+
+      if flattened is not None:
+         arguments = flattened
+
       try:
-         if tool_name == "boolean_operation":
-            return await self._boolean_operation(arguments)
-         elif tool_name == "create_box":
-            return await self._create_box(arguments)
-         elif tool_name == "create_cylinder":
-            return await self._create_cylinder(arguments)
-         elif tool_name == "create_document":
-            return await self._create_document(arguments)
-         elif tool_name == "create_pad":
-            return await self._create_pad(arguments)
-         elif tool_name == "create_pocket":
-            return await self._create_pocket(arguments)
-         elif tool_name == "create_sketch":
-            return await self._create_sketch(arguments)
-         elif tool_name == "create_sphere":
-            return await self._create_sphere(arguments)
-         elif tool_name == "export_stl":
-            return await self._export_stl(arguments)
-         elif tool_name == "list_objects":
-            return await self._list_objects()
-         elif tool_name == "move_object":
-            return await self._move_object(arguments)
-         elif tool_name == "rotate_object":
-            return await self._rotate_object(arguments)
-         elif tool_name == "save_document":
-            return await self._save_document(arguments)
-         else:
-            return f"Unknown tool: {tool_name}"
+         return await fn(**arguments)
       except Exception as e:
          return f"Error executing {tool_name}: {str(e)}"
 
    ## ==========================================================================
    ## PRIVATE METHODS
    ## ==========================================================================
-   async def _boolean_operation(self, args: Dict[str, Any]) -> str:
+   def _next_name(self, prefix: str) -> str:
+      idx = self._name_seq[prefix]
+      self._name_seq[prefix] += 1
+      return f"{prefix}_{idx}"
+
+   def _get_object(self, name: str):
+      obj = self._obj_cache.get(name)
+
+      if obj is None:
+         obj = self.doc.getObject(name)
+
+         if obj is not None:
+            self._obj_cache[name] = obj
+
+      return obj
+
+   async def _boolean_operation(self, *, operation: str, base_object: str, tool_object: str, result_name: str | None = None, defer_recompute: bool = False) -> str:
       if not self.doc:
          logger.info("BooleanOperation: No document available, ignoring boolean operation...")
          return "No document available"
 
-      base_name = args["base_object"]
-      operation = args["operation"]
-      result_name = args.get("result_name", f"{operation}_{len(self.doc.Objects)}")
-      tool_name = args["tool_object"]
+      result_name = result_name or self._next_name(operation)
 
-      base_obj = self.doc.getObject(base_name)
-      tool_obj = self.doc.getObject(tool_name)
+      base_obj = self._get_object(base_object)
+      tool_obj = self._get_object(tool_object)
 
       if not base_obj or not tool_obj:
-         return f"Could not find objects: {base_name}, {tool_name}"
-
-      if operation == "cut":
-         result = self.doc.addObject("Part::Cut", result_name)
-      elif operation == "intersection":
-         result = self.doc.addObject("Part::Common", result_name)
-      elif operation == "union":
-         result = self.doc.addObject("Part::Fuse", result_name)
-      else:
-         return f"Unknown operation: {operation}"
+         return f"Could not find objects: {base_object}, {tool_object}"
+
+      with self._doc_lock:
+         if operation == "cut":
+            result = self.doc.addObject("Part::Cut", result_name)
+         elif operation == "intersection":
+            result = self.doc.addObject("Part::Common", result_name)
+         elif operation == "union":
+            result = self.doc.addObject("Part::Fuse", result_name)
+         else:
+            return f"Unknown operation: {operation}"
 
-      result.Base = base_obj
-      result.Tool = tool_obj
+         result.Base = base_obj
+         result.Tool = tool_obj
+         self._obj_cache[result_name] = result
+
+         if not defer_recompute:
+            self.doc.recompute()
 
-      self.doc.recompute()
       return f"Created {operation} operation '{result_name}'"
 
-   async def _create_box(self, args: Dict[str, Any]) -> str:
+   async def _create_box(self, *, length: float, width: float, height: float, position: Vec3 = ORIGIN, name: str | None = None, defer_recompute: bool = False) -> str:
       if not self.doc:
          logger.info("CreateBox: No document available, creating new document...")
          self.doc = FreeCAD.newDocument("Document")
 
-      height = args["height"]
-      length = args["length"]
-      name = args.get("name", f"Box_{len(self.doc.Objects)}")
-      position = args.get("position", {"x": 0, "y": 0, "z": 0})
-      width = args["width"]
-
-      box = self.doc.addObject("Part::Box", name)
-      box.Height = height
-      box.Length = length
-      box.Placement.Base = FreeCAD.Vector(
-         position["x"], position["y"], position["z"]
-      )
-      box.Width = width
-
-      self.doc.recompute()
+      name = name or self._next_name("Box")
+
+      with self._doc_lock:
+         box = self.doc.addObject("Part::Box", name)
+         self._obj_cache[name] = box
+         box.Height = height
+         box.Length = length
+         box.Placement.Base = FreeCAD.Vector(*position)
+         box.Width = width
+
+         if not defer_recompute:
+            self.doc.recompute()
+
       return f"Created box '{name}' with dimensions {length}x{width}x{height}mm"
 
-   async def _create_cylinder(self, args: Dict[str, Any]) -> str:
+   async def _create_cylinder(self, *, radius: float, height: float, position: Vec3 = ORIGIN, name: str | None = None, defer_recompute: bool = False) -> str:
       if not self.doc:
          logger.info("CreateCylinder: No document available, creating new document...")
          self.doc = FreeCAD.newDocument("Document")
 
-      height = args["height"]
-      name = args.get("name", f"Cylinder_{len(self.doc.Objects)}")
-      position = args.get("position", {"x": 0, "y": 0, "z": 0})
-      radius = args["radius"]
+      name = name or self._next_name("Cylinder")
 
-      cylinder = self.doc.addObject("Part::Cylinder", name)
-      cylinder.Height = height
-      cylinder.Placement.Base = FreeCAD.Vector(
-         position["x"], position["y"], position["z"]
-      )
-      cylinder.Radius = radius
+      with self._doc_lock:
+         cylinder = self.doc.addObject("Part::Cylinder", name)
+         self._obj_cache[name] = cylinder
+         cylinder.Height = height
+         cylinder.Placement.Base = FreeCAD.Vector(*position)
+         cylinder.Radius = radius
+
+         if not defer_recompute:
+            self.doc.recompute()
 
-      self.doc.recompute()
       return f"Created cylinder '{name}' with radius {radius}mm and height {height}mm"
 
-   async def _create_document(self, args: Dict[str, Any]) -> str:
+   async def _create_document(self, *, name: str = "Document") -> str:
       if not freecad_available:
          return "Error: FreeCAD is not available. Please install FreeCAD and restart the server."
 
       logger.info("CreateDocument: Starting new document creation...")
-      doc_name = args.get("name", "Document")
-      self.doc = FreeCAD.newDocument(doc_name)
-      return f"Created document: {doc_name}"
+      self.doc = FreeCAD.newDocument(name)
+      self._name_seq.clear()
+      self._obj_cache.clear()
+      return f"Created document: {name}"
 
-   async def _create_sketch(self, args: Dict[str, Any]) -> str:
+   async def _create_sketch(self, *, plane: str, name: str | None = None) -> str:
       if not self.doc:
          logger.info("CreateSketch: No document available, creating new document...")
          self.doc = FreeCAD.newDocument("Document")
 
-      return f"Not implemented: {str(args)}"
+      return f"Not implemented: create_sketch(plane={plane!r}, name={name!r})"
 
-   async def _create_sphere(self, args: Dict[str, Any]) -> str:
+   async def _create_sphere(self, *, radius: float, position: Vec3 = ORIGIN, name: str | None = None, defer_recompute: bool = False) -> str:
       if not self.doc:
          logger.info("CreateSphere: No document available, creating new document...")
          self.doc = FreeCAD.newDocument("Document")
 
-      name = args.get("name", f"Sphere_{len(self.doc.Objects)}")
-      position = args.get("position", {"x": 0, "y": 0, "z": 0})
-      radius = args["radius"]
+      name = name or self._next_name("Sphere")
+
+      with self._doc_lock:
+         sphere = self.doc.addObject("Part::Sphere", name)
+         self._obj_cache[name] = sphere
+         sphere.Placement.Base = FreeCAD.Vector(*position)
+         sphere.Radius = radius
 
-      sphere = self.doc.addObject("Part::Sphere", name)
-      sphere.Placement.Base = FreeCAD.Vector(
-         position["x"], position["y"], position["z"]
-      )
-      sphere.Radius = radius
+         if not defer_recompute:
+            self.doc.recompute()
 
-      self.doc.recompute()
       return f"Created sphere '{name}' with radius {radius}mm"
 
-   async def _create_pad(self, args: Dict[str, Any]) -> str:
+   async def _create_pad(self, *, sketch_name: str, length: float, reversed: bool = False, name: str | None = None) -> str:
       if not self.doc:
          logger.info("CreatePad: No document available, creating new document...")
          self.doc = FreeCAD.newDocument("Document")
 
       # TODO: Implement PartDesign Pad operation from a sketch
-      # Expected args: sketch_name (str), length (float), reversed (bool), name (str)
-      return f"Not implemented: create_pad {str(args)}"
+      return f"Not implemented: create_pad(sketch_name={sketch_name!r}, length={length}, reversed={reversed}, name={name!r})"
 
-   async def _create_pocket(self, args: Dict[str, Any]) -> str:
+   async def _create_pocket(self, *, sketch_name: str, length: float, name: str | None = None) -> str:
       if not self.doc:
          logger.info("CreatePocket: No document available, creating new document...")
          self.doc = FreeCAD.newDocument("Document")
 
       # TODO: Implement PartDesign Pocket operation from a sketch
-      # Expected args: sketch_name (str), length (float), name (str)
-      return f"Not implemented: create_pocket {str(args)}"
+      return f"Not implemented: create_pocket(sketch_name={sketch_name!r}, length={length}, name={name!r})"
 
-   async def _export_stl(self, args: Dict[str, Any]) -> str:
+   async def _export_stl(self, *, objects: list, filepath: str) -> str:
       if not self.doc:
          logger.warning("ExportSTL: No document available, nothing to export, ignoring request...")
          return "No document available"
 
-      filepath = args["filepath"]
-      object_names = args["objects"]
+      object_names = objects
       objects = []
 
       for name in object_names:
-         obj = self.doc.getObject(name)
+         obj = self._get_object(name)
 
          if obj:
             logger.debug(f"ExportSTL: Adding object to list: {name}")
@@ -395,24 +444,11 @@ class MCPServerFreeCAD:
 
       if len(objects) > 0:
          logger.debug(f"ExportSTL: Exporting {len(objects)} objects to: {filepath}")
-         import Mesh
-         meshes = []
-
-         for obj in objects:
-            logger.debug(f"ExportSTL: Adding object to mesh: {obj.Label}")
-            mesh = Mesh.Mesh()
-            mesh.addFacets(obj.Shape.tessellate(0.1))
-            meshes.append(mesh)
 
-         if len(meshes) == 1:
-            meshes[0].write(filepath)
-         else:
-            combined = meshes[0]
-
-            for mesh in meshes[1:]:
-               combined.addMesh(mesh)
-
-            combined.write(filepath)
+         # Export is CPU- and I/O-heavy but doesn't mutate the document, so
+         # run it on a worker thread and keep the event loop free to serve
+         # other tool calls in the meantime.
+         await asyncio.to_thread(self._export_stl_blocking, objects, filepath)
 
          logger.debug(f"ExportSTL: Exported {len(objects)} objects to: {filepath}")
          return f"Exported {len(objects)} objects to: {filepath}"
@@ -420,6 +456,49 @@ class MCPServerFreeCAD:
          logger.debug("ExportSTL: No valid objects found for export")
          return "No valid objects found for export"
 
+   def _export_stl_blocking(self, objects: list, filepath: str) -> None:
+      # Tessellation is the CPU-heavy step and runs in OCCT C++ code that
+      # releases the GIL, so independent shapes tessellate in parallel. The
+      # document lock keeps concurrent tool calls from mutating shapes
+      # mid-read; the file write below needs no lock.
+      max_workers = int(os.environ.get("MCP_FREECAD_TESSELLATE_WORKERS", os.cpu_count() or 1))
+
+      with self._doc_lock:
+         with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tessellated = list(executor.map(lambda obj: obj.Shape.tessellate(0.1), objects))
+
+      # Stream each shape's facets straight into a binary STL file instead
+      # of building a combined in-memory mesh first: peak memory stays at
+      # one shape's tessellation and no merge copies are made. The facet
+      # count at offset 80 is patched in once all shapes are written.
+      total_facets = 0
+
+      with open(filepath, "wb") as stl_file:
+         stl_file.write(b"\x00" * 80)
+         stl_file.write(struct.pack("<I", 0))
+
+         for points, facets in tessellated:
+            if _mesh_numba.NUMBA_AVAILABLE:
+               stl_file.write(_mesh_numba.facet_records(points, facets))
+            else:
+               for i, j, k in facets:
+                  stl_file.write(_pack_facet(points[i], points[j], points[k]))
+
+            total_facets += len(facets)
+
+         stl_file.seek(80)
+         stl_file.write(struct.pack("<I", total_facets))
+
+   async def _flush(self) -> str:
+      if not self.doc:
+         logger.warning("Flush: No document available, nothing to recompute, ignoring request...")
+         return "No document available"
+
+      with self._doc_lock:
+         self.doc.recompute()
+
+      return "Document recomputed"
+
    async def _list_objects(self) -> str:
       if not self.doc:
          logger.warning("ListObjects: No document available, nothing to list, ignoring request...")
@@ -434,60 +513,58 @@ class MCPServerFreeCAD:
       logger.debug(f"ListObjects: Found {len(objects)} objects in document")
       return f"Objects in document:\n" + "\n".join(objects)
 
-   async def _move_object(self, args: Dict[str, Any]) -> str:
+   async def _move_object(self, *, object_name: str, vector: Vec3, defer_recompute: bool = False) -> str:
       if not self.doc:
          logger.warning("MoveObject: No document available, ignoring request...")
          return "No document available"
 
-      object_name = args["object_name"]
-      obj = self.doc.getObject(object_name)
-      vec = args["vector"]
+      obj = self._get_object(object_name)
 
       if not obj:
          logger.warning(f"MoveObject: Object not found: {object_name}")
          return f"Object not found: {object_name}"
 
-      ox = float(vec.get("x", 0))
-      oy = float(vec.get("y", 0))
-      oz = float(vec.get("z", 0))
+      ox, oy, oz = vector
 
-      current = obj.Placement.Base
-      obj.Placement.Base = FreeCAD.Vector(current.x + ox, current.y + oy, current.z + oz)
+      with self._doc_lock:
+         current = obj.Placement.Base
+         obj.Placement.Base = FreeCAD.Vector(current.x + ox, current.y + oy, current.z + oz)
+
+         if not defer_recompute:
+            self.doc.recompute()
 
-      self.doc.recompute()
       return f"Moved '{object_name}' by ({ox}, {oy}, {oz})"
 
-   async def _rotate_object(self, args: Dict[str, Any]) -> str:
+   async def _rotate_object(self, *, object_name: str, angle: float, axis: Vec3 = Z_AXIS, defer_recompute: bool = False) -> str:
       if not self.doc:
          logger.warning("RotateObject: No document available, ignoring request...")
          return "No document available"
 
-      angle = float(args["angle"]) # degrees
-      axis = args["axis"]
-      object_name = args["object_name"]
-      obj = self.doc.getObject(object_name)
+      angle = float(angle) # degrees
+      obj = self._get_object(object_name)
 
       if not obj:
          logger.warning(f"RotateObject: Object not found: {object_name}")
          return f"Object not found: {object_name}"
 
-      ox = float(axis.get("x", 0))
-      oy = float(axis.get("y", 0))
-      oz = float(axis.get("z", 1))
+      ox, oy, oz = axis
+
+      with self._doc_lock:
+         base = obj.Placement.Base
+         rotation = FreeCAD.Rotation(_axis_vector(Vec3(float(ox), float(oy), float(oz))), angle)
+         obj.Placement = FreeCAD.Placement(base, rotation)
 
-      base = obj.Placement.Base
-      rotation = FreeCAD.Rotation(FreeCAD.Vector(ox, oy, oz), angle)
-      obj.Placement = FreeCAD.Placement(base, rotation)
+         if not defer_recompute:
+            self.doc.recompute()
 
-      self.doc.recompute()
       return f"Rotated '{object_name}' around axis ({ox}, {oy}, {oz}) by {angle} degrees"
 
-   async def _save_document(self, args: Dict[str, Any]) -> str:
+   async def _save_document(self, *, filepath: str) -> str:
       if not self.doc:
          logger.warning("SaveDocument: No document available, nothing to save, ignoring request...")
          return "No document available"
 
-      filepath = args["filepath"]
-      self.doc.saveAs(filepath)
+      with self._doc_lock:
+         self.doc.saveAs(filepath)
       logger.debug(f"SaveDocument: Document saved to: {filepath}")
       return f"Document saved to: {filepath}"
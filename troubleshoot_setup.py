@@ -3,163 +3,376 @@
 Comprehensive troubleshooting script for MCP FreeCAD server setup.
 This script diagnoses common issues and provides solutions.
 """
+import concurrent.futures
+import fcntl
+import functools
+import io
+import json
+import shutil
 import sys
 import os
 import subprocess
+import threading
+import time
 from pathlib import Path
 
-def check_uv_installation():
-    """Check if uv is properly installed."""
-    print("=== Checking uv installation ===")
+try:
+    # SIMD-accelerated parser; several times faster than stdlib json on
+    # large configs. Optional — fall back to the stdlib when missing.
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+# Resolved once at import: Path.cwd() is a getcwd syscall and Path.home()
+# a passwd/env lookup per call, and the checks never chdir, so the values
+# cannot go stale mid-run.
+_HOME = Path.home()
+_CWD = Path.cwd()
+
+# Fixed install locations, built once: every Path join allocates a new
+# PurePath, so precompute the handful of paths the checks probe.
+FREECAD_APP = Path("/Applications/FreeCAD.app")
+FREECAD_CONTENTS = FREECAD_APP / "Contents"
+FREECAD_RESOURCES = FREECAD_CONTENTS / "Resources"
+FREECAD_LIB = FREECAD_RESOURCES / "lib"
+CLAUDE_CONFIG = _HOME / "Library" / "Application Support" / "Claude" / "claude_desktop_config.json"
+
+@functools.lru_cache(maxsize=1)
+def _uv_probe(path_env):
+    """Resolve the uv binary and its version once per PATH value.
+
+    Both check_uv_installation and check_entry_point need uv; memoizing
+    saves a second PATH walk and a second process spawn.
+    """
+    uv_path = shutil.which('uv')
+    if uv_path is None:
+        return None, None
     try:
-        result = subprocess.run(['uv', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"✅ uv is installed: {result.stdout.strip()}")
-            return True
-        else:
-            print("❌ uv is not working properly")
-            return False
-    except FileNotFoundError:
-        print("❌ uv is not installed or not in PATH")
+        # Only the short version line is needed; skip the locale codec and
+        # decode a bounded prefix ourselves.
+        result = subprocess.run([uv_path, '--version'],
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return uv_path, None
+    if result.returncode != 0:
+        return uv_path, None
+    return uv_path, result.stdout[:64].decode('ascii', 'replace').strip()
+
+@functools.lru_cache(maxsize=1)
+def _import_freecad():
+    """Attempt the FreeCAD import once, returning (module, error).
+
+    Resolving the spec first means the common failure path costs a
+    sys.path scan instead of loading the FreeCAD C++ extension (hundreds
+    of ms of dylib load + static init) just to fail. Memoized so the
+    background preload in main() and check_freecad_installation share a
+    single import.
+    """
+    import importlib.util
+    if importlib.util.find_spec('FreeCAD') is None:
+        return None, ImportError("No module named 'FreeCAD'")
+    try:
+        import FreeCAD
+    except ImportError as e:
+        return None, e
+    return FreeCAD, None
+
+# Set by main(): thread running _import_freecad so the dylib load overlaps
+# the other checks' subprocess waits instead of serializing behind them.
+_freecad_preload = None
+
+def _dir_names(directory):
+    """List a directory's entry names with one scandir; empty set if unreadable."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+@functools.lru_cache(maxsize=8)
+def _load_json(path_str, mtime_ns):
+    """Parse a JSON file, memoized on (path, mtime) so repeated runs reuse
+    the parsed dict and edits invalidate the entry automatically."""
+    with open(path_str, "rb") as f:
+        return _loads(f.read())
+
+def check_uv_installation(out):
+    """Check if uv is properly installed."""
+    print("=== Checking uv installation ===", file=out)
+    uv_path, version = _uv_probe(os.environ.get('PATH', ''))
+    if uv_path is None:
+        print("❌ uv is not installed or not in PATH", file=out)
         return False
+    if version is None:
+        print("❌ uv is not working properly", file=out)
+        return False
+    print(f"✅ uv is installed: {version}", file=out)
+    return True
 
-def check_entry_point():
+def check_entry_point(out):
     """Check if the mcp-server-freecad entry point works."""
-    print("\n=== Checking entry point ===")
-    try:
-        # Test with a quick timeout to avoid hanging
-        result = subprocess.run(['uv', 'run', 'mcp-server-freecad', '--help'],
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            print("✅ Entry point works")
+    print("\n=== Checking entry point ===", file=out)
+
+    # If the console script is already on PATH, probe it directly and skip
+    # uv's resolver/venv-sync pass (several seconds when cold).
+    exe = shutil.which('mcp-server-freecad')
+    if exe:
+        try:
+            # stdout is discarded either way; only stderr is reported
+            result = subprocess.run([exe, '--help'],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                  text=True, timeout=3)
+            if result.returncode == 0:
+                print(f"✅ Entry point works ({exe})", file=out)
+                return True
+            else:
+                print(f"❌ Entry point failed: {result.stderr}", file=out)
+                return False
+        except subprocess.TimeoutExpired:
+            print(f"✅ Entry point starts ({exe}, timed out waiting for help)", file=out)
             return True
-        else:
-            print(f"❌ Entry point failed: {result.stderr}")
-            return False
-    except subprocess.TimeoutExpired:
-        print("✅ Entry point starts (timed out waiting for help)")
-        return True
+
+    uv_path, _ = _uv_probe(os.environ.get('PATH', ''))
+    if uv_path is None:
+        print("❌ Entry point not found", file=out)
+        return False
+
+    try:
+        # stderr merges into the probed pipe so a child spewing errors
+        # can neither stall on a full stderr buffer nor hide its output.
+        proc = subprocess.Popen([uv_path, 'run', 'mcp-server-freecad', '--help'],
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     except FileNotFoundError:
-        print("❌ Entry point not found")
+        print("❌ Entry point not found", file=out)
         return False
 
-def check_freecad_installation():
+    # Poll instead of blocking on completion: the moment the child prints
+    # anything, the entry point has resolved and loaded, so there is no
+    # need to sit out the full 10s timeout that subprocess.run would when
+    # --help never terminates the server.
+    fd = proc.stdout.fileno()
+    fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+    captured = bytearray()
+    deadline = time.monotonic() + 10.0
+    grace = None
+    while proc.poll() is None:
+        now = time.monotonic()
+        if now >= deadline or (grace is not None and now >= grace):
+            break
+        try:
+            chunk = os.read(fd, 4096)
+        except BlockingIOError:
+            chunk = b""
+        if chunk:
+            captured += chunk
+            if grace is None:
+                # First output: the entry point resolved and loaded. Keep
+                # draining briefly in case this is a traceback and the
+                # child is about to exit with a real returncode.
+                grace = now + 1.0
+            continue
+        time.sleep(0.1)
+
+    if proc.poll() is None:
+        proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        if captured:
+            print("✅ Entry point works (responded before exiting)", file=out)
+        else:
+            print("✅ Entry point starts (timed out waiting for help)", file=out)
+        return True
+
+    # The child exited on its own; drain what it left in the pipe for the
+    # failure report before closing it.
+    while True:
+        try:
+            chunk = os.read(fd, 4096)
+        except (BlockingIOError, OSError):
+            break
+        if not chunk:
+            break
+        captured += chunk
+    proc.stdout.close()
+
+    if proc.returncode == 0:
+        print("✅ Entry point works", file=out)
+        return True
+    print(f"❌ Entry point failed: {captured.decode(errors='replace')}", file=out)
+    return False
+
+def check_freecad_installation(out):
     """Check FreeCAD installation and Python module availability."""
-    print("\n=== Checking FreeCAD installation ===")
+    print("\n=== Checking FreeCAD installation ===", file=out)
 
-    # Check if FreeCAD app exists
-    freecad_app = Path("/Applications/FreeCAD.app")
-    if freecad_app.exists():
-        print(f"✅ FreeCAD app found at {freecad_app}")
-    else:
-        print("❌ FreeCAD app not found in /Applications/")
+    # Existence is all we need here: os.access(F_OK) is one faccessat call
+    # with no stat buffer to unpack and no exception on the missing path.
+    if not os.access(str(FREECAD_APP), os.F_OK):
+        print("❌ FreeCAD app not found in /Applications/", file=out)
         return False
+    print(f"✅ FreeCAD app found at {FREECAD_APP}", file=out)
 
-    # Check if FreeCAD Python modules are accessible
-    try:
-        import FreeCAD
-        print(f"✅ FreeCAD Python module imported successfully (version: {FreeCAD.Version()})")
+    # Check if FreeCAD Python modules are accessible. main() started the
+    # import in the background while other checks ran; by the time this
+    # executes the dylib load has usually already finished.
+    if _freecad_preload is not None:
+        _freecad_preload.join()
+    freecad_mod, import_error = _import_freecad()
+    if freecad_mod is not None:
+        print(f"✅ FreeCAD Python module imported successfully (version: {freecad_mod.Version()})", file=out)
         return True
-    except ImportError as e:
-        print(f"❌ FreeCAD Python modules not accessible: {e}")
-
-        # Suggest common FreeCAD Python paths
-        common_paths = [
-            "/Applications/FreeCAD.app/Contents/Resources/lib",
-            "/Applications/FreeCAD.app/Contents/lib",
-            "/Applications/FreeCAD.app/Contents/Resources/lib/python3.11/site-packages"
-        ]
-
-        print("\n🔧 Possible solutions:")
-        print("1. Add FreeCAD Python path to PYTHONPATH:")
-        for path in common_paths:
-            if Path(path).exists():
-                print(f"   export PYTHONPATH=\"{path}:$PYTHONPATH\"")
-
-        print("\n2. Check actual FreeCAD Python paths:")
-        freecad_lib = freecad_app / "Contents" / "Resources" / "lib"
-        if freecad_lib.exists():
-            print(f"   Found lib directory: {freecad_lib}")
-            for item in freecad_lib.iterdir():
-                if item.is_dir() and "python" in item.name:
-                    print(f"   Python directory: {item}")
+    else:
+        print(f"❌ FreeCAD Python modules not accessible: {import_error}", file=out)
+
+        print("\n🔧 Possible solutions:", file=out)
+        print("1. Add FreeCAD Python path to PYTHONPATH:", file=out)
+
+        # Suggest common FreeCAD Python paths; one scandir per parent
+        # directory and set membership instead of a stat per candidate.
+        contents_names = _dir_names(FREECAD_CONTENTS)
+        resources_names = _dir_names(FREECAD_RESOURCES) if "Resources" in contents_names else set()
+
+        existing_paths = []
+        if "lib" in resources_names:
+            existing_paths.append(str(FREECAD_LIB))
+        if "lib" in contents_names:
+            existing_paths.append(str(FREECAD_CONTENTS / "lib"))
+        if "lib" in resources_names and "site-packages" in _dir_names(FREECAD_LIB / "python3.11"):
+            existing_paths.append(str(FREECAD_LIB / "python3.11" / "site-packages"))
+
+        for path in existing_paths:
+            print(f"   export PYTHONPATH=\"{path}:$PYTHONPATH\"", file=out)
+
+        print("\n2. Check actual FreeCAD Python paths:", file=out)
+        try:
+            # One scandir instead of exists() + iterdir() + a stat per child;
+            # DirEntry.is_dir reuses the dirent type from the directory read.
+            with os.scandir(FREECAD_LIB) as entries:
+                print(f"   Found lib directory: {FREECAD_LIB}", file=out)
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False) and "python" in entry.name:
+                        print(f"   Python directory: {entry.path}", file=out)
+        except OSError:
+            pass
 
         return False
 
-def check_claude_desktop_config():
+def check_claude_desktop_config(out):
     """Check Claude Desktop configuration."""
-    print("\n=== Checking Claude Desktop configuration ===")
+    print("\n=== Checking Claude Desktop configuration ===", file=out)
 
-    config_path = Path.home() / "Library" / "Application Support" / "Claude" / "claude_desktop_config.json"
-    if config_path.exists():
-        print(f"✅ Claude Desktop config found at {config_path}")
+    try:
+        # One stat doubles as the existence check and the cache key below
+        st = os.stat(CLAUDE_CONFIG)
+    except OSError:
+        print(f"❌ Claude Desktop config not found at {CLAUDE_CONFIG}", file=out)
+        print("🔧 Create the config file with the FreeCAD MCP server configuration", file=out)
+    else:
+        print(f"✅ Claude Desktop config found at {CLAUDE_CONFIG}", file=out)
         try:
-            import json
-            with open(config_path) as f:
-                config = json.load(f)
+            config = _load_json(str(CLAUDE_CONFIG), st.st_mtime_ns)
 
             if "mcpServers" in config and "freecad" in config["mcpServers"]:
                 freecad_config = config["mcpServers"]["freecad"]
-                print("✅ FreeCAD MCP server configured")
-                print(f"   Command: {freecad_config.get('command', 'Not set')}")
-                print(f"   Args: {freecad_config.get('args', 'Not set')}")
-                print(f"   Working directory: {freecad_config.get('cwd', 'Not set')}")
+                print("✅ FreeCAD MCP server configured", file=out)
+                print(f"   Command: {freecad_config.get('command', 'Not set')}", file=out)
+                print(f"   Args: {freecad_config.get('args', 'Not set')}", file=out)
+                print(f"   Working directory: {freecad_config.get('cwd', 'Not set')}", file=out)
 
                 # Check if the working directory exists and is correct
                 cwd = freecad_config.get('cwd')
-                if cwd and Path(cwd).exists():
-                    print("✅ Working directory exists")
-                    if Path(cwd).resolve() == Path.cwd().resolve():
-                        print("✅ Working directory matches current directory")
+                if cwd and os.access(cwd, os.F_OK):
+                    print("✅ Working directory exists", file=out)
+                    if Path(cwd).resolve() == _CWD.resolve():
+                        print("✅ Working directory matches current directory", file=out)
                     else:
-                        print(f"⚠️  Working directory mismatch. Config: {cwd}, Current: {Path.cwd()}")
+                        print(f"⚠️  Working directory mismatch. Config: {cwd}, Current: {_CWD}", file=out)
                 elif cwd:
-                    print(f"❌ Working directory does not exist: {cwd}")
+                    print(f"❌ Working directory does not exist: {cwd}", file=out)
 
             else:
-                print("❌ FreeCAD MCP server not configured")
-                print("\n🔧 Add this to your claude_desktop_config.json:")
+                print("❌ FreeCAD MCP server not configured", file=out)
+                print("\n🔧 Add this to your claude_desktop_config.json:", file=out)
                 print(f'''{{
   "mcpServers": {{
     "freecad": {{
       "command": "uv",
       "args": ["run", "mcp-server-freecad"],
-      "cwd": "{Path.cwd()}"
+      "cwd": "{_CWD}"
     }}
   }}
-}}''')
+}}''', file=out)
         except Exception as e:
-            print(f"❌ Error reading config: {e}")
-    else:
-        print(f"❌ Claude Desktop config not found at {config_path}")
-        print("🔧 Create the config file with the FreeCAD MCP server configuration")
+            print(f"❌ Error reading config: {e}", file=out)
 
-def test_server_startup():
+def test_server_startup(out):
     """Test if the server can start properly."""
-    print("\n=== Testing server startup ===")
+    print("\n=== Testing server startup ===", file=out)
     try:
-        result = subprocess.run(['python', 'test_server.py'],
-                              capture_output=True, text=True, timeout=30)
-        if "Server instance created successfully" in result.stdout:
-            print("✅ Server can be created")
-        if "Entry points work correctly" in result.stdout:
-            print("✅ Entry points configured correctly")
-        if "FreeCAD modules not available" in result.stderr:
-            print("⚠️  FreeCAD modules not available (expected if not configured)")
-        if result.returncode == 0:
-            print("✅ test_server.py completed successfully")
+        # Run test_server.py in-process instead of spawning another
+        # interpreter that re-imports the whole project.
+        import contextlib
+        import runpy
+
+        buf_out, buf_err = io.StringIO(), io.StringIO()
+        returncode = 0
+        with contextlib.redirect_stdout(buf_out), contextlib.redirect_stderr(buf_err):
+            try:
+                runpy.run_path('test_server.py', run_name='__main__')
+            except SystemExit as e:
+                returncode = e.code or 0
+            except Exception:
+                returncode = 1
+
+        stdout, stderr = buf_out.getvalue(), buf_err.getvalue()
+        if "Server instance created successfully" in stdout:
+            print("✅ Server can be created", file=out)
+        if "Entry points work correctly" in stdout:
+            print("✅ Entry points configured correctly", file=out)
+        # loguru writes its warnings to the real stderr, not the redirect,
+        # so ask the (already imported) server module directly.
+        server_mod = sys.modules.get('src.mcp_server_freecad.server')
+        if server_mod is not None and not server_mod.freecad_available:
+            print("⚠️  FreeCAD modules not available (expected if not configured)", file=out)
+        if returncode == 0:
+            print("✅ test_server.py completed successfully", file=out)
         else:
-            print(f"❌ test_server.py failed: {result.stderr}")
-    except subprocess.TimeoutExpired:
-        print("⚠️  Server test timed out (server might be running)")
+            print(f"❌ test_server.py failed: {stderr}", file=out)
+    except Exception as e:
+        print(f"❌ Error running server test: {e}", file=out)
+
+def run_check(check):
+    """Run one check against its own output buffer, never raising."""
+    out = io.StringIO()
+    try:
+        ok = check(out)
     except Exception as e:
-        print(f"❌ Error running server test: {e}")
+        print(f"❌ Check failed with error: {e}", file=out)
+        ok = False
+    return bool(ok), out.getvalue()
 
 def main():
     """Run all troubleshooting checks."""
     print("🔧 MCP FreeCAD Server Troubleshooting")
     print("=" * 50)
 
+    # Import the server package on the main thread before the pool starts:
+    # its numba kernels compile at import, and llvmlite can wedge interpreter
+    # shutdown when that first happens on a worker thread (as it would inside
+    # test_server_startup's in-process run).
+    try:
+        import src.mcp_server_freecad.server  # noqa: F401
+    except Exception:
+        pass
+
+    # Start the FreeCAD import now — the single most expensive operation
+    # in the script — so its latency hides behind the subprocess waits of
+    # the other checks.
+    global _freecad_preload
+    _freecad_preload = threading.Thread(target=_import_freecad, daemon=True)
+    _freecad_preload.start()
+
     checks = [
         check_uv_installation,
         check_entry_point,
@@ -168,14 +381,23 @@ def main():
         test_server_startup
     ]
 
+    # Each check mostly waits on subprocesses (the GIL is released), so run
+    # them all at once and report in the original order: wall time becomes
+    # the slowest check instead of the sum of all of them.
+    # Print only after every check has finished: test_server_startup
+    # temporarily redirects the process-wide stdout, so writing results
+    # while it is still running could leak them into its capture buffer.
     results = []
-    for check in checks:
-        try:
-            result = check()
-            results.append(result)
-        except Exception as e:
-            print(f"❌ Check failed with error: {e}")
-            results.append(False)
+    outputs = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [executor.submit(run_check, check) for check in checks]
+        for future in futures:
+            ok, output = future.result()
+            results.append(ok)
+            outputs.append(output)
+
+    for output in outputs:
+        print(output, end="")
 
     print("\n" + "=" * 50)
     print("📊 Summary:")